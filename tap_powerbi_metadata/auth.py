@@ -1,15 +1,49 @@
 """Authentication classes for tap-powerbi-metadata."""
 
-from urllib.parse import urljoin
+import threading
+from functools import cached_property
+from typing import Dict, Optional, Tuple
 
-from singer_sdk.authenticators import OAuthAuthenticator, SingletonMeta
+from singer_sdk.authenticators import OAuthAuthenticator
+from singer_sdk.helpers._util import utc_now
 
 AUTH_URL = "https://api.powerbi.com/v1.0/myorg"
-    
-class PowerBIMetadataAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
+
+#: Treat the token as expired this many seconds early, so no request goes out with a
+#: token that lapses in flight.
+TOKEN_EXPIRY_MARGIN = 60
+#: Refresh the token in the background this many seconds before it expires.
+TOKEN_REFRESH_LEAD = 300
+
+#: Authenticators shared by every stream, keyed by (tenant_id, client_id, username).
+#: The password grant issues the token to the user, so each user gets their own.
+_AUTH_CACHE: Dict[Tuple[str, str, str], "PowerBIMetadataAuthenticator"] = {}
+_AUTH_CACHE_LOCK = threading.Lock()
+
+class PowerBIMetadataAuthenticator(OAuthAuthenticator):
     # https://pivotalbi.com/automate-your-power-bi-dataset-refresh-with-python
 
-    @property
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._refresh_lock = threading.RLock()
+        self._refresh_timer: Optional[threading.Timer] = None
+
+    @classmethod
+    def for_stream(cls, stream) -> "PowerBIMetadataAuthenticator":
+        """Return the authenticator for the stream's tenant, client and user.
+
+        Streams with the same credentials share one instance, and so one token.
+        """
+        key = (stream.config["tenant_id"], stream.config["client_id"], stream.config["username"])
+        authenticator = _AUTH_CACHE.get(key)
+        if authenticator is None:
+            with _AUTH_CACHE_LOCK:
+                authenticator = _AUTH_CACHE.get(key)
+                if authenticator is None:
+                    authenticator = _AUTH_CACHE[key] = cls(stream)
+        return authenticator
+
+    @cached_property
     def oauth_request_body(self) -> dict:
         return {
             'grant_type': 'password',
@@ -20,10 +54,54 @@ class PowerBIMetadataAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
             'password': self.config["password"],
         }
     
-    @property
+    @cached_property
     def auth_endpoint(self) -> str:
-        base= "https://login.microsoftonline.com/"
-        tenant = self.config['tenant_id']
-        endpoint = f"/{tenant}/oauth2/token"
-        # oauth_scopes="https://analysis.windows.net/powerbi/api",
-        return urljoin(base, endpoint)
\ No newline at end of file
+        return f"https://login.microsoftonline.com/{self.config['tenant_id']}/oauth2/token"
+
+    @property
+    def oauth_scopes(self) -> str:
+        return "https://analysis.windows.net/powerbi/api"
+
+    @property
+    def auth_headers(self) -> dict:
+        # Only one thread refreshes an expired token; the others wait and reuse it.
+        if not self.is_token_valid():
+            with self._refresh_lock:
+                if not self.is_token_valid():
+                    self.update_access_token()
+        return super().auth_headers
+
+    def is_token_valid(self) -> bool:
+        if self.last_refreshed is None:
+            return False
+        if not self.expires_in:
+            return True
+        elapsed = (utc_now() - self.last_refreshed).total_seconds()
+        return self.expires_in - TOKEN_EXPIRY_MARGIN > elapsed
+
+    def update_access_token(self) -> None:
+        """Refresh the token and schedule the next refresh ahead of its expiry.
+
+        The scheduled refresh runs on a daemon timer thread, so paging never has to
+        wait on the token endpoint while the tap keeps running.
+        """
+        with self._refresh_lock:
+            super().update_access_token()
+            self._schedule_refresh()
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_timer:
+            self._refresh_timer.cancel()
+        if not self.expires_in or self.expires_in <= TOKEN_REFRESH_LEAD:
+            return
+        delay = self.expires_in - TOKEN_REFRESH_LEAD
+        self._refresh_timer = threading.Timer(delay, self._refresh_in_background)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.update_access_token()
+        except Exception as ex:
+            # The next request refreshes inline once the token is no longer valid.
+            self.logger.warning(f"Background OAuth token refresh failed: {ex}")
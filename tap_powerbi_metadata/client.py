@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
+import itertools
 import json
-import uuid
+import queue
+import threading
+from collections import deque
+from concurrent.futures import CancelledError, Executor, ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime, timedelta
+from functools import cached_property, partial
 
-from typing import Any, Dict, Generator, Iterable, Optional, Union
-from urllib import parse
-from urllib.parse import parse_qsl, urljoin
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote
 
+import orjson
 import requests
-from memoization import cached
+from requests.adapters import HTTPAdapter
+from singer_sdk import metrics
 from singer_sdk.streams import RESTStream
 
 from tap_powerbi_metadata.auth import PowerBIMetadataAuthenticator
@@ -20,6 +27,108 @@ from tap_powerbi_metadata.auth import PowerBIMetadataAuthenticator
 API_URL = "https://api.powerbi.com/v1.0/myorg"
 API_DATE_FORMAT = "'%Y-%m-%dT%H:%M:%SZ'"
 
+#: Process-wide session shared by every stream, so the pooled keep-alive connections
+#: (and their TLS sessions) to api.powerbi.com are reused across pages and streams.
+#: Retries stay with the SDK's backoff decorator rather than the adapter.
+SHARED_SESSION = requests.Session()
+SHARED_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+
+def format_api_date(value: datetime) -> str:
+    """Format a datetime as a quoted API_DATE_FORMAT string without `strftime`."""
+    return (
+        f"'{value.year:04d}-{value.month:02d}-{value.day:02d}"
+        f"T{value.hour:02d}:{value.minute:02d}:{value.second:02d}Z'"
+    )
+
+
+def decode_response(response: requests.Response) -> dict:
+    """Return the decoded JSON body of a response, decoding it only once.
+
+    The decoded body is kept on the response so that `parse_response` and
+    `get_next_page_token` share a single parse of each page.
+    """
+    resp_json = getattr(response, "_decoded_json", None)
+    if resp_json is None:
+        resp_json = orjson.loads(response.content)
+        response._decoded_json = resp_json
+    return resp_json
+
+
+def retry_after_wait_generator() -> Generator[float, Any, None]:
+    """Yield the wait before each retry, preferring the response's Retry-After header.
+
+    Follows the `backoff` wait generator protocol: it is primed with `send(None)` and
+    then sent each exception raised by the request. Throttled 429/503 responses from
+    the admin APIs usually say how long to wait; otherwise waits grow as 2, 4, 8, ...
+    """
+    attempt = 0
+    exception = yield
+    while True:
+        attempt += 1
+        wait = 2 ** attempt
+        response = getattr(exception, "response", None)
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.isdigit():
+            wait = int(retry_after)
+        exception = yield wait
+
+
+#: Marks the end of a producer's items in `chain_in_order`.
+_DONE = object()
+
+
+def chain_in_order(
+    executor: Executor, producers: Iterable[Callable], window: int
+) -> Generator[Any, None, None]:
+    """Yield every item of each producer in turn, running up to `window` producers at once.
+
+    Each producer is called on the executor with an `emit` callback and hands its
+    items over one at a time through a queue of size one, so a producer that runs
+    ahead of the caller holds at most two items. When the caller stops iterating,
+    running producers are stopped at their next `emit` and the rest are cancelled.
+    """
+    stop = threading.Event()
+
+    def start(producer: Callable) -> Tuple[Any, queue.Queue]:
+        items: queue.Queue = queue.Queue(maxsize=1)
+
+        def emit(item: Any) -> None:
+            while not stop.is_set():
+                try:
+                    items.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+            raise CancelledError()
+
+        def run() -> None:
+            try:
+                producer(emit)
+            finally:
+                emit(_DONE)
+
+        return executor.submit(run), items
+
+    producers = iter(producers)
+    pending = deque(start(producer) for producer in itertools.islice(producers, window))
+    try:
+        while pending:
+            future, items = pending[0]
+            item = items.get()
+            if item is _DONE:
+                pending.popleft()
+                # Re-raises anything the producer raised.
+                future.result()
+                pending.extend(start(producer) for producer in itertools.islice(producers, 1))
+                continue
+            yield item
+    finally:
+        stop.set()
+        for future, _ in pending:
+            future.cancel()
+
+
 class TapPowerBIMetadataStream(RESTStream):
     """Base class for PowerBIMetadata streams."""
 
@@ -37,8 +146,33 @@ class TapPowerBIMetadataStream(RESTStream):
     #: 5000 is the maximum amount. Shouldn't need to be changed unless a smaller size is required.
     top_value = 5000
 
+    #: Most $skip pages requested concurrently while pages keep coming back full.
+    #: The offsets are known up front, so later pages need not wait on earlier ones.
+    #: Set to 1 for strictly sequential paging.
+    max_workers = 8
+
+    #: Number of rows in the page most recently parsed by `parse_response`.
+    _last_page_rows = 0
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # A $top set in the stream parameters becomes the page size, so $skip advances
+        # by the same amount and the rows held in memory per page stay bounded.
+        stream_top = self.get_stream_params().get("$top")
+        if stream_top:
+            self.top_value = int(stream_top)
+
     def get_stream_config(self) -> dict:
         """Get config for stream."""
+        return self._stream_config
+
+    def get_stream_params(self) -> dict:
+        """Get parameters set in config for stream."""
+        return self._stream_params
+
+    @cached_property
+    def _stream_config(self) -> dict:
+        """Config for this stream, computed once per instance since it is fixed for the run."""
         stream_configs = self.config.get("stream_config", {})
         if not stream_configs:
             string_configs = self.config.get("stream_config_string","")
@@ -46,8 +180,8 @@ class TapPowerBIMetadataStream(RESTStream):
                 stream_configs = json.loads(string_configs)
         return stream_configs.get(self.name, {})
 
-    def get_stream_params(self) -> dict:
-        """Get parameters set in config for stream."""
+    @cached_property
+    def _stream_params(self) -> dict:
         stream_params = self.get_stream_config().get("parameters","")
         return {qry[0]: qry[1] for qry in parse_qsl(stream_params.lstrip("?"))}
     
@@ -58,32 +192,48 @@ class TapPowerBIMetadataStream(RESTStream):
         Args:
             response: A `requests.Response` object. 
 
-        Yields:
-            One item for every item found in the response.
+        Returns:
+            An iterator over every item found in the response.
         
         """
-        resp_json = response.json()
-        for row in resp_json.get("value"):
-            yield row
+        rows = decode_response(response).get("value") or []
+        # Counted here so get_next_page_token can stop paging without rereading the body.
+        self._last_page_rows = len(rows)
+        return iter(rows)
     
     @property
+    def requests_session(self) -> requests.Session:
+        return SHARED_SESSION
+
+    @cached_property
     def authenticator(self) -> PowerBIMetadataAuthenticator:
-        return PowerBIMetadataAuthenticator(self)
+        return PowerBIMetadataAuthenticator.for_stream(self)
+
+    def backoff_wait_generator(self) -> Generator[float, Any, None]:
+        return retry_after_wait_generator()
     
-    def get_url_params(self, partition: Optional[dict], next_page_token: Optional[Any] = None) -> Dict[str, Any]:
-        """Return a dictionary of values to be used in URL parameterization.
-        
+    @cached_property
+    def _base_url_params(self) -> Dict[str, Any]:
+        """Return the URL parameters shared by every page request of this stream."""
+        params = dict(self.uri_parameters)
+        # Only expand the related collections that are selected in the catalog
+        expand_param = params.get("$expand")
+        if expand_param:
+            expansions = [
+                e for e in expand_param.split(",") if self.mask.get(("properties", e), True)
+            ]
+            if expansions:
+                params["$expand"] = ",".join(expansions)
+            else:
+                del params["$expand"]
 
-        """
-        params = self.uri_parameters
         #Set pagination parameters
         if self.top_required:
             params["$top"] = self.top_value
-        if next_page_token:
-            params["$skip"] = next_page_token
         
         #Set custom config parameters
         stream_params = self.get_stream_params()
+        params.update(stream_params)
 
         # Ensure that $count is True when used in $filter parameter
         filter_params = stream_params.get("$filter", "")
@@ -95,17 +245,27 @@ class TapPowerBIMetadataStream(RESTStream):
         select_param = stream_params.get("$select", "")
         if select_param:
             select_params = select_param.split(",")
+            selected = set(select_params)
 
             missing_primary_keys = [
-                k for k in self.primary_keys if k not in select_params
+                k for k in self.primary_keys if k not in selected
             ]
 
             if missing_primary_keys:
                 select_params.extend(missing_primary_keys)
 
             params["$select"] = ",".join(select_params)
-        params.update(stream_params)
-        self.logger.info(f'PARAMS: {params}')
+        return params
+
+    def get_url_params(self, partition: Optional[dict], next_page_token: Optional[Any] = None) -> Dict[str, Any]:
+        """Return a dictionary of values to be used in URL parameterization.
+        
+        Copies the prebuilt base parameters, so only $skip is set per page.
+        """
+        params = dict(self._base_url_params)
+        if next_page_token:
+            params["$skip"] = next_page_token
+        self.logger.debug("PARAMS: %s", params)
         return params
 
     def get_next_page_token(self, response: requests.Response, previous_token: Optional[Any] = None) -> Optional[Any]:
@@ -122,21 +282,80 @@ class TapPowerBIMetadataStream(RESTStream):
 
         if not self.skip_required:
             return None
-        if not previous_token:
-            next_page_token = self.top_value
-        #if there is a previous_token, but there is not content in the Response object
-        elif not response.json().get('value'):
+        #if there is a previous_token, but the last parsed page had no rows
+        if previous_token and not self._last_page_rows:
             return None
-        else:
-            previous_token += self.top_value
-            next_page_token = previous_token
-        return next_page_token
+        return (previous_token or 0) + self.top_value
+
+    def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Request records, prefetching $skip pages concurrently where they are used.
+
+        The first page is requested on its own. A page with fewer than `top_value`
+        rows is the last one. While pages come back full, the number of pages
+        requested ahead doubles up to `max_workers`, so a stream that fits in one or
+        two pages costs no more requests than sequential paging.
+        """
+        if not self.skip_required or self.max_workers <= 1:
+            yield from super().request_records(context)
+            return
+
+        decorated_request = self.request_decorator(self._request)
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            lock = threading.Lock()
+
+            def count_request() -> None:
+                with lock:
+                    request_counter.increment()
+
+            rows = self._request_page(context, None, decorated_request, count_request)
+            yield from rows
+            if len(rows) < self.top_value:
+                return
+
+            skips = itertools.count(self.top_value, self.top_value)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = deque()
+                window = 1
+                try:
+                    while True:
+                        while len(pending) < window:
+                            pending.append(executor.submit(
+                                self._request_page, context, next(skips), decorated_request, count_request
+                            ))
+                        rows = pending.popleft().result()
+                        yield from rows
+                        if len(rows) < self.top_value:
+                            return
+                        window = min(window * 2, self.max_workers)
+                finally:
+                    # Pages past the end that have not been sent yet are never sent.
+                    for future in pending:
+                        future.cancel()
+
+    def _request_page(
+        self,
+        context: Optional[dict],
+        skip: Optional[int],
+        decorated_request: Callable,
+        count_request: Callable[[], None],
+    ) -> List[dict]:
+        """Request the page starting at `skip` and return its rows."""
+        prepared_request = self.prepare_request(context, next_page_token=skip)
+        response = decorated_request(prepared_request, context)
+        count_request()
+        self.update_sync_costs(prepared_request, response, context)
+        return list(self.parse_response(response))
 
 class TapPowerBIUsageStream(RESTStream):
     """PowerBIUsage stream class."""
 
     url_base = "https://api.powerbi.com/v1.0/myorg"
 
+    #: Number of UTC days requested concurrently. Each day is an independent API query,
+    #: so a backfill can overlap their round trips. Set to 1 for strictly sequential paging.
+    max_workers = 4
+
     def get_url_params(self, partition: Optional[dict], next_page_token: Optional[Any] = None) -> Dict[str, Any]:
         """Return a dictionary of values to be used in URL parameterization.
         
@@ -149,46 +368,46 @@ class TapPowerBIUsageStream(RESTStream):
         else:
             starting_datetime = self.get_starting_timestamp(partition).replace(microsecond=0)
             continuationToken = None
+            # Kept so the first get_next_page_token call need not read it back from the URL.
+            self._initial_start_date = starting_datetime.replace(tzinfo=None)
         if continuationToken:
             params["continuationToken"] = "'" + continuationToken + "'"
         else:
-            params.update({"startDateTime": starting_datetime.strftime(API_DATE_FORMAT)})
+            params.update({"startDateTime": format_api_date(starting_datetime)})
             ending_datetime = starting_datetime.replace(hour=0, minute=0, second=0) + timedelta(days=1) + timedelta(microseconds=-1)
-            params.update({"endDateTime": ending_datetime.strftime(API_DATE_FORMAT)})
+            params.update({"endDateTime": format_api_date(ending_datetime)})
         return params
 
     @property
-    def authenticator(self) -> APIAuthenticatorBase:
-        return PowerBIMetadataAuthenticator(
-            stream=self,
-            auth_endpoint=f"https://login.microsoftonline.com/{self.config['tenant_id']}/oauth2/token",
-            oauth_scopes="https://analysis.windows.net/powerbi/api",
-        )
+    def requests_session(self) -> requests.Session:
+        return SHARED_SESSION
+
+    @cached_property
+    def authenticator(self) -> PowerBIMetadataAuthenticator:
+        return PowerBIMetadataAuthenticator.for_stream(self)
+
+    def backoff_wait_generator(self) -> Generator[float, Any, None]:
+        return retry_after_wait_generator()
 
     def get_next_page_token(self, response: requests.Response, previous_token: Optional[Any] = None) -> Optional[Any]:
         """Return token for identifying next page or None if not applicable."""
-        resp_json = response.json()
-        continuationToken = resp_json.get("continuationToken")
+        continuationToken = self._get_continuation_token(response)
         next_page_token = {}
         if not previous_token:
             # First time creating a pagination token so we need to record the initial start date.
-            req_url = response.request.url
-            req_params = parse.parse_qs(parse.urlparse(req_url).query)
-            self.logger.debug("Params: {}".format(req_params))
-            latest_url_start_date_param = req_params["startDateTime"][0]
-            next_page_token["urlStartDate"] = datetime.strptime(latest_url_start_date_param, API_DATE_FORMAT)
+            next_page_token["urlStartDate"] = self._initial_start_date
         else: 
             next_page_token["urlStartDate"] = previous_token.get("urlStartDate")
         if continuationToken:
-            next_page_token["continuationToken"] = requests.utils.unquote(continuationToken)
+            next_page_token["continuationToken"] = continuationToken
         else:
             next_page_token["continuationToken"] = None
             # Now check if we should repeat API call for next day
             latestUrlStartDate = next_page_token["urlStartDate"]
             nextUrlStartDate = latestUrlStartDate.replace(hour=0, minute=0, second=0) + timedelta(days=1)
-            self.logger.info("No next page token found, checking if {} is greater than now".format(nextUrlStartDate))
+            self.logger.info("No next page token found, checking if %s is greater than now", nextUrlStartDate)
             if nextUrlStartDate < datetime.utcnow():
-                self.logger.info("{} is less than now, incrementing date by 1 and continuing".format(nextUrlStartDate))
+                self.logger.info("%s is less than now, incrementing date by 1 and continuing", nextUrlStartDate)
                 next_page_token["urlStartDate"] = nextUrlStartDate
                 self.logger.debug(next_page_token)
             else:
@@ -196,8 +415,85 @@ class TapPowerBIUsageStream(RESTStream):
                 return None
         return next_page_token
 
+    def _get_continuation_token(self, response: requests.Response) -> Optional[str]:
+        continuationToken = decode_response(response).get("continuationToken")
+        # Tokens are usually URL-safe already, so only unquote when escapes are present.
+        if continuationToken and "%" in continuationToken:
+            continuationToken = unquote(continuationToken)
+        return continuationToken
+
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
         """Parse the response and return an iterator of result rows."""
-        resp_json = response.json()
-        for row in resp_json.get("activityEventEntities"):
-            yield row
+        resp_json = decode_response(response)
+        return iter(resp_json.get("activityEventEntities") or ())
+
+    def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Request records for every UTC day from the starting timestamp until now.
+
+        Up to `max_workers` days are fetched at once on a thread pool. Pages are
+        handed back as they arrive and yielded in day order, so each day ahead of the
+        one being yielded holds at most two pages of rows in memory.
+        """
+        if self.max_workers <= 1:
+            yield from super().request_records(context)
+            return
+
+        decorated_request = self.request_decorator(self._request)
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            lock = threading.Lock()
+
+            def count_request() -> None:
+                with lock:
+                    request_counter.increment()
+
+            days = (
+                partial(self._request_day, context, day_start, decorated_request, count_request)
+                for day_start in self._get_day_starts(context)
+            )
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pages = chain_in_order(executor, days, self.max_workers)
+                with closing(pages):
+                    for rows in pages:
+                        yield from rows
+
+    def _get_day_starts(self, context: Optional[dict]) -> List[datetime]:
+        """Return the start of each UTC day to request, up to the current day."""
+        day_start = self.get_starting_timestamp(context).replace(microsecond=0, tzinfo=None)
+        day_starts = [day_start]
+        next_day_start = day_start.replace(hour=0, minute=0, second=0) + timedelta(days=1)
+        now = datetime.utcnow()
+        while next_day_start < now:
+            day_starts.append(next_day_start)
+            next_day_start += timedelta(days=1)
+        return day_starts
+
+    def _request_day(
+        self,
+        context: Optional[dict],
+        day_start: datetime,
+        decorated_request: Callable,
+        count_request: Callable[[], None],
+        emit: Callable[[List[dict]], None],
+    ) -> None:
+        """Page through a single UTC day with its continuation tokens.
+
+        Each page's rows are passed to `emit` as soon as the page arrives.
+        """
+        next_page_token = {"urlStartDate": day_start, "continuationToken": None}
+        while True:
+            prepared_request = self.prepare_request(context, next_page_token=next_page_token)
+            response = decorated_request(prepared_request, context)
+            count_request()
+            self.update_sync_costs(prepared_request, response, context)
+            emit(list(self.parse_response(response)))
+            previous_token = next_page_token["continuationToken"]
+            continuationToken = self._get_continuation_token(response)
+            if not continuationToken:
+                return
+            if continuationToken == previous_token:
+                raise RuntimeError(
+                    f"Loop detected in pagination. Pagination token {continuationToken} is "
+                    "identical to prior token."
+                )
+            next_page_token = {"urlStartDate": day_start, "continuationToken": continuationToken}
@@ -1,14 +1,9 @@
 """Stream class for tap-powerbi-metadata."""
 
-from copy import deepcopy
-from datetime import datetime, timedelta
-from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
-from urllib import parse
-import requests
-import json
+from typing import Optional
 
 from tap_powerbi_metadata.client import TapPowerBIMetadataStream, TapPowerBIUsageStream
+from singer_sdk.helpers._typing import TypeConformanceLevel
 from singer_sdk.typing import (
     AnyType,
     ArrayType,
@@ -22,6 +17,20 @@ from singer_sdk.typing import (
     StringType,
 )
 
+#: Sub-schemas shared by several properties, built once and reused.
+DATASET_REFERENCES = ArrayType(
+    ObjectType(
+        Property("DatasetId", StringType),
+        Property("DatasetName", StringType),
+    )
+)
+GIT_ARTIFACTS = ArrayType(
+    ObjectType(
+        Property("LogicalId", StringType),
+        Property("ObjectId", StringType),
+    )
+)
+
 class RefreshablesStream(TapPowerBIMetadataStream):
     """Returns a list of audit activity events for a tenant.
     Docs: https://learn.microsoft.com/en-us/rest/api/power-bi/admin/get-activity-events
@@ -44,7 +53,6 @@ class RefreshablesStream(TapPowerBIMetadataStream):
         Property("averageDuration", NumberType),
         Property("medianDuration", NumberType),
         Property("refreshesPerDay", IntegerType),
-        Property("startTime", StringType),
         Property(
             "lastRefresh",
             ObjectType(
@@ -83,6 +91,18 @@ class ActivityEventsStream(TapPowerBIUsageStream):
     path = "/admin/activityevents"
     primary_keys = ["Id"]
     replication_key = "CreationTime"
+
+    @property
+    def TYPE_CONFORMANCE_LEVEL(self) -> TypeConformanceLevel:
+        """Conform only top-level properties when `activity_events_root_conformance` is set.
+
+        This skips walking every nested object, but nested objects and arrays are then
+        emitted as the API returned them, including keys the schema does not declare.
+        """
+        if self.config.get("activity_events_root_conformance"):
+            return TypeConformanceLevel.ROOT_ONLY
+        return TypeConformanceLevel.RECURSIVE
+
     schema = PropertiesList(
         # Keys
         Property("Id", StringType, required=True),
@@ -168,12 +188,7 @@ class ActivityEventsStream(TapPowerBIUsageStream):
         Property("DatasetName", StringType),
         Property(
             "Datasets",
-            ArrayType(
-                ObjectType(
-                    Property("DatasetId", StringType),
-                    Property("DatasetName", StringType),
-                )
-            )
+            DATASET_REFERENCES,
         ),
         Property("DatasourceId", StringType),
         Property("DatasourceDetails", BooleanType),
@@ -229,7 +244,6 @@ class ActivityEventsStream(TapPowerBIUsageStream):
         Property("ExportEventActivityTypeParameter", StringType),
         Property("ExportEventEndDateTimeParameter", DateTimeType),
         Property("ExportEventStartDateTimeParameter", DateTimeType),
-        Property("ExternalSubscribeeInformation", StringType),
         Property(
            "ExternalSubscribeeInformation",
             ArrayType(
@@ -327,32 +341,17 @@ class ActivityEventsStream(TapPowerBIUsageStream):
             ObjectType(
                 Property(
                     "AddedArtifacts",
-                    ArrayType(
-                        ObjectType(
-                            Property("LogicalId", StringType),
-                            Property("ObjectId", StringType),
-                        )
-                    )
+                    GIT_ARTIFACTS,
                 ),
                 Property("BranchName", StringType),
                 Property(
                     "DeletedArtifacts",
-                    ArrayType(
-                        ObjectType(
-                            Property("LogicalId", StringType),
-                            Property("ObjectId", StringType),
-                        )
-                    )
+                    GIT_ARTIFACTS,
                 ),
                 Property("FromCommitId", StringType),
                 Property(
                     "ModifiedArtifacts",
-                    ArrayType(
-                        ObjectType(
-                            Property("LogicalId", StringType),
-                            Property("ObjectId", StringType),
-                        )
-                    )
+                    GIT_ARTIFACTS,
                 ),
                 Property("OrganizationName", StringType),
                 Property("ProjectName", StringType),
@@ -656,12 +655,7 @@ class DatasetStream(TapPowerBIMetadataStream):
         ),
         Property(
             "upstreamDatasets",
-            ArrayType(
-                ObjectType(
-                    Property("DatasetId", StringType),
-                    Property("DatasetName", StringType),
-                )
-            )
+            DATASET_REFERENCES,
         ),
         # users is empty and will be removed in a future release
         # Property("users", ArrayType(StringType)),
@@ -731,7 +725,7 @@ class GroupsStream(TapPowerBIMetadataStream):
         Property("dataflowStorageId", StringType),
         Property("defaultDatasetStorageFormat", StringType),
         Property("description", StringType),
-        Property("hasWorkspaceLevelSettings ", BooleanType),
+        Property("hasWorkspaceLevelSettings", BooleanType),
         Property("isOnDedicatedCapacity", BooleanType),
         Property("isReadOnly", BooleanType),
         Property("logAnalyticsWorkspace", StringType),
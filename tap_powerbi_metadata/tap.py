@@ -1,9 +1,16 @@
 """PowerBIMetadata tap class."""
 
-from pathlib import Path
-from typing import List
+import sys
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List
+
+import orjson
 from singer_sdk import Tap, Stream
+from singer_sdk._singerlib import Message, RecordMessage
+from singer_sdk._singerlib.messages import format_message as sdk_format_message
 from singer_sdk.typing import (
+    BooleanType,
     DateTimeType,
     PropertiesList,
     Property,
@@ -12,7 +19,6 @@ from singer_sdk.typing import (
 )
 
 from tap_powerbi_metadata.streams import (
-    TapPowerBIMetadataStream,
     ActivityEventsStream,
     AppsStream,
     GroupsStream,
@@ -25,7 +31,7 @@ from tap_powerbi_metadata.streams import (
 
 PLUGIN_NAME = "tap-powerbi-metadata"
 
-STREAM_TYPES = [
+STREAM_TYPES = (
     ActivityEventsStream,
     AppsStream,
     GroupsStream,
@@ -34,8 +40,7 @@ STREAM_TYPES = [
     DatasetStream,
     # Commenting out DataSources stream because it is not ready to be extracted to Snowflake
     # DataSourceStream,
-
-]
+)
 
 
 class TapPowerBIMetadata(Tap):
@@ -54,13 +59,61 @@ class TapPowerBIMetadata(Tap):
                 StringType
             )
         )),
-        Property("stream_config_string", StringType)
+        Property("stream_config_string", StringType),
+        Property("activity_events_root_conformance", BooleanType, default=False)
     ).to_dict()
 
     def discover_streams(self) -> List[Stream]:
         """Return a list of discovered streams."""
         return [stream_class(tap=self) for stream_class in STREAM_TYPES]
 
+    def format_message(self, message: Message) -> str:
+        """Format a Singer message as a JSON line using orjson.
+
+        Records are encoded with orjson's C encoder instead of the SDK's
+        simplejson-based `format_message`, with the same output: datetimes use
+        `isoformat(sep="T")` and other unknown types fall back to `str`. Messages
+        holding a `Decimal` go through the SDK encoder, which writes decimals as
+        JSON numbers.
+        """
+        return self._encode_message(message).decode()
+
+    def write_message(self, message: Message) -> None:
+        """Write a Singer message to stdout.
+
+        Encoded bytes go straight to the stdout buffer. Records are left for the
+        buffer to flush in blocks, and any other message (schema, state) flushes
+        it, so a state is never emitted ahead of the records it covers.
+        """
+        stdout = getattr(sys.stdout, "buffer", None)
+        if stdout is None:
+            sys.stdout.write(self.format_message(message) + "\n")
+        else:
+            stdout.write(self._encode_message(message) + b"\n")
+        if not isinstance(message, RecordMessage):
+            sys.stdout.flush()
+
+    @staticmethod
+    def _encode_message(message: Message) -> bytes:
+        try:
+            return orjson.dumps(
+                message.to_dict(),
+                default=_default_encoding,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            return sdk_format_message(message).encode()
+
+
+def _default_encoding(obj: Any) -> str:
+    """Encode values orjson does not handle the way the SDK's encoder does."""
+    if isinstance(obj, datetime):
+        return obj.isoformat(sep="T")
+    if isinstance(obj, Decimal):
+        # orjson cannot write a decimal as a number, so let the SDK encode the message.
+        raise TypeError
+    return str(obj)
+
 
 # CLI Execution:
 
@@ -0,0 +1,78 @@
+"""Tests for the OAuth token lifecycle that do not call the token endpoint."""
+
+from datetime import timedelta
+from unittest import mock
+
+from singer_sdk.authenticators import OAuthAuthenticator
+from singer_sdk.helpers._util import utc_now
+
+from tap_powerbi_metadata import auth
+from tap_powerbi_metadata.auth import PowerBIMetadataAuthenticator
+from tap_powerbi_metadata.tap import TapPowerBIMetadata
+
+SAMPLE_CONFIG = {
+    "tenant_id": "common",
+    "client_id": "client",
+    "username": "user@example.com",
+    "password": "password",
+}
+
+
+def get_authenticator():
+    tap = TapPowerBIMetadata(config=SAMPLE_CONFIG, parse_env_config=False)
+    return PowerBIMetadataAuthenticator(tap.streams["Groups"])
+
+
+def fake_token(expires_in):
+    def update_access_token(self):
+        self.access_token = "token"
+        self.expires_in = expires_in
+        self.last_refreshed = utc_now()
+    return update_access_token
+
+
+def test_token_expires_a_margin_early():
+    authenticator = get_authenticator()
+    assert not authenticator.is_token_valid()
+
+    authenticator.expires_in = 3600
+    lapse = authenticator.expires_in - auth.TOKEN_EXPIRY_MARGIN
+    authenticator.last_refreshed = utc_now() - timedelta(seconds=lapse - 5)
+    assert authenticator.is_token_valid()
+    authenticator.last_refreshed = utc_now() - timedelta(seconds=lapse + 5)
+    assert not authenticator.is_token_valid()
+
+
+def test_refresh_is_scheduled_ahead_of_expiry():
+    authenticator = get_authenticator()
+    with mock.patch.object(OAuthAuthenticator, "update_access_token", fake_token(3600)), \
+            mock.patch.object(auth.threading, "Timer") as timer:
+        authenticator.update_access_token()
+        timer.assert_called_once_with(
+            3600 - auth.TOKEN_REFRESH_LEAD, authenticator._refresh_in_background
+        )
+        first_timer = timer.return_value
+        assert first_timer.daemon is True
+        first_timer.start.assert_called_once_with()
+
+        authenticator.update_access_token()
+        first_timer.cancel.assert_called_once_with()
+        assert timer.call_count == 2
+
+
+def test_short_lived_token_is_not_scheduled():
+    authenticator = get_authenticator()
+    with mock.patch.object(OAuthAuthenticator, "update_access_token", fake_token(auth.TOKEN_REFRESH_LEAD)), \
+            mock.patch.object(auth.threading, "Timer") as timer:
+        authenticator.update_access_token()
+    timer.assert_not_called()
+
+
+def test_failed_background_refresh_falls_back_to_inline_refresh():
+    authenticator = get_authenticator()
+    with mock.patch.object(OAuthAuthenticator, "update_access_token", side_effect=RuntimeError("down")), \
+            mock.patch.object(authenticator.logger, "warning") as warning:
+        authenticator._refresh_in_background()
+    warning.assert_called_once()
+    # No token was stored, so the next request refreshes inline.
+    assert not authenticator.is_token_valid()
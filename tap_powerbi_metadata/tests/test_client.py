@@ -0,0 +1,290 @@
+"""Tests for the base stream classes that do not call the Power BI API."""
+
+import ast
+import gc
+import io
+import sys
+import weakref
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import orjson
+import pendulum
+import pytest
+import requests
+import simplejson
+from singer_sdk._singerlib import RecordMessage, StateMessage
+from singer_sdk._singerlib.messages import format_message
+from singer_sdk.exceptions import RetriableAPIError
+from singer_sdk.helpers._typing import conform_record_data_types
+
+from tap_powerbi_metadata import client, streams
+from tap_powerbi_metadata.auth import PowerBIMetadataAuthenticator
+from tap_powerbi_metadata.tap import TapPowerBIMetadata
+
+SAMPLE_CONFIG = {
+    "tenant_id": "common",
+    "client_id": "client",
+    "username": "user@example.com",
+    "password": "password",
+    "start_date": "2023-01-01T00:00:00Z",
+}
+
+
+def get_stream(name, **config):
+    tap = TapPowerBIMetadata(config={**SAMPLE_CONFIG, **config}, parse_env_config=False)
+    return {stream.name: stream for stream in tap.discover_streams()}[name]
+
+
+def make_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = orjson.dumps(body)
+    return response
+
+
+def test_url_params_do_not_leak_between_pages():
+    stream = get_stream("Groups")
+    assert stream.get_url_params(None, 5000)["$skip"] == 5000
+    assert "$skip" not in stream.get_url_params(None, None)
+    assert "$skip" not in type(stream).uri_parameters
+
+
+def test_configured_top_sets_page_size():
+    stream = get_stream(
+        "Groups", stream_config={"Groups": {"parameters": "?$top=100"}}
+    )
+    assert stream.top_value == 100
+    assert stream.get_next_page_token(make_response({"value": [{}]}), None) == 100
+
+
+def test_empty_page_stops_pagination():
+    stream = get_stream("Groups")
+    list(stream.parse_response(make_response({"value": [{}]})))
+    assert stream.get_next_page_token(None, 5000) == 10000
+    list(stream.parse_response(make_response({"value": []})))
+    assert stream.get_next_page_token(None, 10000) is None
+
+
+def test_select_includes_primary_keys():
+    stream = get_stream(
+        "Reports", stream_config={"Reports": {"parameters": "?$select=name,webUrl"}}
+    )
+    assert stream.get_url_params(None, None)["$select"] == "name,webUrl,id"
+
+
+class FixedDatetime(datetime):
+    @classmethod
+    def utcnow(cls):
+        return cls(2023, 1, 4, 12, 0, 0)
+
+
+def test_activity_event_days_are_yielded_in_order():
+    def send(prepared_request, **kwargs):
+        query = parse_qs(urlparse(prepared_request.url).query)
+        if "continuationToken" in query:
+            day = query["continuationToken"][0].strip("'")
+            return make_response({"activityEventEntities": [{"Id": f"{day}-2"}]})
+        day = query["startDateTime"][0][1:11]
+        return make_response(
+            {"activityEventEntities": [{"Id": f"{day}-1"}], "continuationToken": day}
+        )
+
+    stream = get_stream("ActivityEvents")
+    stream._write_starting_replication_value(None)
+    with mock.patch.object(client, "datetime", FixedDatetime), \
+            mock.patch.object(client.SHARED_SESSION, "send", side_effect=send), \
+            mock.patch.object(PowerBIMetadataAuthenticator, "__call__", lambda self, r: r):
+        ids = [row["Id"] for row in stream.request_records(None)]
+
+    days = ["2023-01-01", "2023-01-02", "2023-01-03", "2023-01-04"]
+    assert ids == [f"{day}-{page}" for day in days for page in (1, 2)]
+
+
+def test_repeated_continuation_token_raises():
+    def send(prepared_request, **kwargs):
+        return make_response({"activityEventEntities": [{"Id": "a"}], "continuationToken": "same"})
+
+    stream = get_stream("ActivityEvents", start_date="2023-01-04T00:00:00Z")
+    stream._write_starting_replication_value(None)
+    with mock.patch.object(client, "datetime", FixedDatetime), \
+            mock.patch.object(client.SHARED_SESSION, "send", side_effect=send), \
+            mock.patch.object(PowerBIMetadataAuthenticator, "__call__", lambda self, r: r):
+        with pytest.raises(RuntimeError, match="Loop detected in pagination"):
+            list(stream.request_records(None))
+
+
+def test_activity_event_pages_are_yielded_as_they_arrive():
+    sent = []
+
+    def send(prepared_request, **kwargs):
+        query = parse_qs(urlparse(prepared_request.url).query)
+        page = int(query.get("continuationToken", ["'0'"])[0].strip("'"))
+        sent.append(page)
+        body = {"activityEventEntities": [{"Id": str(page)}]}
+        if page < 50:
+            body["continuationToken"] = str(page + 1)
+        return make_response(body)
+
+    stream = get_stream("ActivityEvents", start_date="2023-01-04T00:00:00Z")
+    stream._write_starting_replication_value(None)
+    with mock.patch.object(client, "datetime", FixedDatetime), \
+            mock.patch.object(client.SHARED_SESSION, "send", side_effect=send), \
+            mock.patch.object(PowerBIMetadataAuthenticator, "__call__", lambda self, r: r):
+        records = stream.request_records(None)
+        assert next(records)["Id"] == "0"
+        # The worker runs at most two pages ahead of the consumer.
+        assert len(sent) <= 3
+        records.close()
+    assert len(sent) <= 3
+
+
+def test_skip_pages_are_yielded_in_order():
+    def sync(row_count):
+        calls = []
+
+        def send(prepared_request, **kwargs):
+            skip = int(parse_qs(urlparse(prepared_request.url).query).get("$skip", ["0"])[0])
+            calls.append(skip)
+            rows = [{"id": str(n)} for n in range(skip, min(skip + 5, row_count))]
+            return make_response({"value": rows})
+
+        stream = get_stream("Groups")
+        stream.top_value = 5
+        with mock.patch.object(client.SHARED_SESSION, "send", side_effect=send), \
+                mock.patch.object(PowerBIMetadataAuthenticator, "__call__", lambda self, r: r):
+            ids = [row["id"] for row in stream.request_records(None)]
+        assert ids == [str(n) for n in range(row_count)]
+        return sorted(calls)
+
+    # A short page ends the sync without requesting anything past it.
+    assert sync(3) == [0]
+    assert sync(7) == [0, 5]
+    # Pages requested ahead grow from one, so at most a window's worth is wasted.
+    calls = sync(48)
+    assert calls[:10] == [0, 5, 10, 15, 20, 25, 30, 35, 40, 45]
+    assert len(calls) <= 10 + get_stream("Groups").max_workers - 1
+
+
+def test_authenticator_is_shared_per_client():
+    groups, reports = get_stream("Groups"), get_stream("Reports")
+    other = get_stream("Groups", client_id="other-client")
+    other_user = get_stream("Groups", username="other-user")
+    assert groups.authenticator is reports.authenticator
+    assert groups.authenticator is not other.authenticator
+    assert groups.authenticator is not other_user.authenticator
+
+
+def test_backoff_honours_retry_after():
+    throttled = make_response({})
+    throttled.status_code = 429
+    throttled.headers["Retry-After"] = "17"
+    wait = get_stream("Groups").backoff_wait_generator()
+    wait.send(None)
+    assert wait.send(RetriableAPIError("throttled", throttled)) == 17
+    assert wait.send(requests.exceptions.ConnectionError()) == 4
+
+
+def test_expand_skips_deselected_collections():
+    stream = get_stream("Groups")
+    for expansion in ("users", "reports", "dashboards", "datasets", "dataflows"):
+        stream.metadata[("properties", expansion)].selected = False
+    stream._mask = None
+    assert stream.get_url_params(None, None)["$expand"] == "workbooks"
+
+
+def test_schemas_have_no_duplicate_or_padded_property_names():
+    tree = ast.parse(Path(streams.__file__).read_text())
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and getattr(node.func, "id", None) in ("PropertiesList", "ObjectType")):
+            continue
+        names = [
+            arg.args[0].value
+            for arg in node.args
+            if isinstance(arg, ast.Call) and getattr(arg.func, "id", None) == "Property"
+        ]
+        assert len(names) == len(set(names)), f"duplicate property on line {node.lineno}"
+        assert all(name == name.strip() for name in names), f"padded property on line {node.lineno}"
+
+
+def test_activity_events_conformance_level():
+    record = {"Id": "a", "Undeclared": "x", "Datasets": [{"DatasetId": "d", "Secret": "s"}]}
+
+    def conform(stream):
+        return conform_record_data_types(
+            stream.name, record, stream.schema, stream.TYPE_CONFORMANCE_LEVEL, stream.logger
+        )
+
+    # Undeclared nested keys are dropped by default.
+    conformed = conform(get_stream("ActivityEvents"))
+    assert "Undeclared" not in conformed
+    assert conformed["Datasets"] == [{"DatasetId": "d"}]
+    # Opting in to root-only conformance passes nested values through unchanged.
+    conformed = conform(get_stream("ActivityEvents", activity_events_root_conformance=True))
+    assert "Undeclared" not in conformed
+    assert conformed["Datasets"] == [{"DatasetId": "d", "Secret": "s"}]
+
+
+def test_messages_encode_like_the_sdk():
+    tap = TapPowerBIMetadata(config=SAMPLE_CONFIG, parse_env_config=False)
+    message = RecordMessage(
+        "Groups",
+        {
+            "p": pendulum.datetime(2023, 1, 1),
+            "n": datetime(2023, 1, 1, 12, 30),
+            "dec": Decimal("1.10"),
+            "s": "x",
+        },
+    )
+    for record in ({k: v for k, v in message.record.items() if k != "dec"}, message.record):
+        message.record = record
+        ours, sdk = tap.format_message(message), format_message(message)
+        assert simplejson.loads(ours, use_decimal=True) == simplejson.loads(sdk, use_decimal=True)
+        assert '"2023-01-01T00:00:00+00:00"' in ours
+    assert '"dec": 1.10' in ours
+
+
+class RecordingRaw(io.RawIOBase):
+    def __init__(self):
+        self.written = b""
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.written += bytes(data)
+        return len(data)
+
+
+def test_records_stay_buffered_until_a_state_is_written():
+    tap = TapPowerBIMetadata(config=SAMPLE_CONFIG, parse_env_config=False)
+    raw = RecordingRaw()
+    stdout = io.TextIOWrapper(io.BufferedWriter(raw, buffer_size=1 << 16))
+    with mock.patch.object(sys, "stdout", stdout):
+        tap.write_message(RecordMessage("Groups", {"id": "a"}))
+        assert raw.written == b""
+        tap.write_message(StateMessage({"bookmarks": {}}))
+        lines = raw.written.decode().splitlines()
+    assert [orjson.loads(line)["type"] for line in lines] == ["RECORD", "STATE"]
+
+
+def test_messages_are_written_to_a_stdout_without_a_buffer():
+    tap = TapPowerBIMetadata(config=SAMPLE_CONFIG, parse_env_config=False)
+    stdout = io.StringIO()
+    with mock.patch.object(sys, "stdout", stdout):
+        tap.write_message(RecordMessage("Groups", {"id": "a"}))
+        tap.write_message(StateMessage({"bookmarks": {}}))
+    lines = stdout.getvalue().splitlines()
+    assert [orjson.loads(line)["type"] for line in lines] == ["RECORD", "STATE"]
+
+
+def test_stream_params_are_cached_per_instance():
+    stream = get_stream("Groups", stream_config={"Groups": {"parameters": "?$top=100"}})
+    assert stream.get_stream_params() is stream.get_stream_params()
+    stream_ref = weakref.ref(stream)
+    del stream
+    gc.collect()
+    assert stream_ref() is None